@@ -1,18 +1,51 @@
 #!/usr/bin/env python3
 
+import argparse
 import json
 import subprocess
+import sys
 import platform
+import shutil
 import ipaddress
+import re
 from datetime import datetime
 import time
+from collections import deque
+
+# Optional: orjson reads the object export and writes the report much faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: icmplib pings every IP from a single socket instead of one process per IP
+try:
+    import icmplib
+except ImportError:
+    icmplib = None
+
+# Dotted-quad IPv4 address followed by a CIDR prefix (e.g. '192.168.1.1/24')
+IPV4_CIDR_RE = re.compile(r'((?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])(?:\.(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])){3})/')
+
+# Ping status lines are written to stdout at most LOG_FLUSH_EVERY at once,
+# and never held back longer than LOG_FLUSH_INTERVAL seconds
+LOG_FLUSH_EVERY = 50
+LOG_FLUSH_INTERVAL = 1.0
+
+# Keep each fping command line well below the OS argument size limit
+FPING_CHUNK_SIZE = 1024
 
 class ObjectsPingChecker:
     
-    def __init__(self, json_file_path='objectcheck.json'):
+    def __init__(self, json_file_path='objectcheck.json', max_workers=64, interactive=False):
         """Initialize the ping checker with JSON data from local file"""
         self.json_file = json_file_path
+        self.max_workers = max_workers
+        self.interactive = interactive
+        self.fping_path = shutil.which("fping")
         self.objects_data = None
+        self._log_buf = []
+        self._last_flush = time.monotonic()
         self.results = {
             'failed_pings': [],
             'successful_count': 0,
@@ -22,16 +55,20 @@ class ObjectsPingChecker:
     def load_objects_json(self):
         """Load objects data from local JSON file"""
         try:
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                self.objects_data = json.load(f)
+            with open(self.json_file, 'rb') as f:
+                raw = f.read()
+            self.objects_data = orjson.loads(raw) if orjson else json.loads(raw)
             print(f"Successfully loaded {self.json_file} from local directory!")
             return True
         except FileNotFoundError:
-            time.sleep(2)
+            if self.interactive:
+                time.sleep(2)
             print(f"Error: File '{self.json_file}' not found in current directory")
-            time.sleep(1)
+            if self.interactive:
+                time.sleep(1)
             print("Please ensure the file is in the same directory as this script.")
-            time.sleep(1)
+            if self.interactive:
+                time.sleep(1)
             return False
         except json.JSONDecodeError as e:
             print(f"Error: Invalid JSON format in {self.json_file}")
@@ -44,31 +81,136 @@ class ObjectsPingChecker:
     
     def _extract_ip_from_cidr(self, ip_cidr):
         """Extract IP address from CIDR notation (e.g., '192.168.1.1/24' -> '192.168.1.1')"""
-        try:
-            # Handle CIDR notation
-            if '/' in ip_cidr:
-                ip_part = ip_cidr.split('/')[0]
-                # Validate if it's a real IP address
-                ip_obj = ipaddress.ip_address(ip_part)
+        # Fast path for IPv4, no IPv4Address object is built just to validate
+        match = IPV4_CIDR_RE.match(ip_cidr)
+        if match:
+            return match.group(1)
+        
+        # IPv6 is rare in object exports, let ipaddress validate it
+        if ':' in ip_cidr and '/' in ip_cidr:
+            ip_part = ip_cidr.split('/')[0]
+            try:
+                ipaddress.IPv6Address(ip_part)
                 return ip_part
-            return None
-        except (ValueError, ipaddress.AddressValueError):
+            except ValueError:
+                return None
+        return None
+    
+    def _ping_command(self, ip_address):
+        """Build the ping command for the current operating system"""
+        if platform.system().lower() == "windows":
+            return ["ping", "-n", "1", "-w", "3000", ip_address]
+        return ["ping", "-c", "1", "-W", "3", ip_address]
+    
+    def _icmplib_alive(self, ips):
+        """Ping all IPs over a single icmplib socket, return the set of alive IPs or None"""
+        try:
+            hosts = icmplib.multiping(
+                ips, count=1, interval=0.01, timeout=2,
+                concurrent_tasks=128, privileged=False
+            )
+            return {host.address for host in hosts if host.is_alive}
+        except icmplib.ICMPLibError as e:
+            print(f"icmplib unavailable ({e}), falling back")
             return None
     
-    def _ping_ip(self, ip_address):
-        """Ping a single IP address and return True if successful, False otherwise"""
+    def _fping_alive(self, ips):
+        """Ping all IPs with one fping process per chunk, return the set of alive IPs or None"""
+        alive = set()
         try:
-            # Determine ping command based on operating system
-            if platform.system().lower() == "windows":
-                cmd = ["ping", "-n", "1", "-w", "3000", ip_address]
-            else:
-                cmd = ["ping", "-c", "1", "-W", "3", ip_address]
+            for start in range(0, len(ips), FPING_CHUNK_SIZE):
+                cmd = [self.fping_path, "-a", "-q", "-r1", "-t", "2000", *ips[start:start + FPING_CHUNK_SIZE]]
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                
+                # fping exits 1 when some hosts are unreachable, 3+ on real errors
+                if result.returncode > 2:
+                    print(f"fping failed ({result.stderr.strip()}), falling back to the ping command")
+                    return None
+                alive.update(result.stdout.split())
+            return alive
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"fping failed ({e}), falling back to the ping command")
+            return None
+    
+    def _ping_targets(self, targets):
+        """Ping every (ip, name, cidr) target and yield (index, result dict) as each finishes"""
+        if not targets:
+            return
+        
+        # Batch pingers handle every IP at once; Windows keeps the ping binary
+        alive = None
+        if platform.system().lower() != "windows":
+            ips = list(dict.fromkeys(ip for ip, _, _ in targets))
+            if icmplib:
+                alive = self._icmplib_alive(ips)
+            if alive is None and self.fping_path:
+                alive = self._fping_alive(ips)
+        
+        if alive is not None:
+            for i, (ip_address, name, ip_cidr) in enumerate(targets):
+                yield i, {
+                    'name': name,
+                    'ip_address': ip_address,
+                    'original_cidr': ip_cidr,
+                    'success': ip_address in alive
+                }
+            return
+        
+        # A missing binary must not be reported as unreachable hosts
+        if not shutil.which("ping"):
+            raise FileNotFoundError("'ping' command not found")
+        
+        # Keep up to max_workers ping processes running and reap them in launch order
+        running = deque()
+        pending = iter(enumerate(targets))
+        while True:
+            while len(running) < max(1, self.max_workers):
+                item = next(pending, None)
+                if item is None:
+                    break
+                i, (ip_address, _, _) = item
+                proc = subprocess.Popen(
+                    self._ping_command(ip_address),
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                running.append((i, proc, time.monotonic() + 5))
             
-            # Execute ping command with timeout
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError):
-            return False
+            if not running:
+                break
+            
+            i, proc, deadline = running.popleft()
+            
+            # Show the results so far before blocking on a slow ping
+            if proc.poll() is None:
+                self._flush_log()
+            try:
+                success = proc.wait(timeout=max(0, deadline - time.monotonic())) == 0
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                success = False
+            
+            ip_address, name, ip_cidr = targets[i]
+            yield i, {
+                'name': name,
+                'ip_address': ip_address,
+                'original_cidr': ip_cidr,
+                'success': success
+            }
+    
+    def _emit(self, line):
+        """Buffer a status line, written to stdout in batches to keep the output live but cheap"""
+        self._log_buf.append(line + "\n")
+        if len(self._log_buf) >= LOG_FLUSH_EVERY or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL:
+            self._flush_log()
+    
+    def _flush_log(self):
+        """Write every buffered status line to stdout"""
+        if self._log_buf:
+            sys.stdout.write(''.join(self._log_buf))
+            sys.stdout.flush()
+            self._log_buf.clear()
+        self._last_flush = time.monotonic()
     
     def ping_all_objects(self):
         """Ping all IP addresses found in objects and collect results"""
@@ -79,37 +221,42 @@ class ObjectsPingChecker:
         print("Starting ping test for all object IP addresses...")
         print("-" * 50)
         
-        # Process each object in the JSON
+        # Collect every valid IP first so the pings can run concurrently
+        targets = []
         for obj in self.objects_data:
             name = obj.get('Name', ['Unknown'])[0] if obj.get('Name') else 'Unknown'
-            ip_list = obj.get('IP', [])
-            
-            # Skip if no IP addresses found
-            if not ip_list:
-                continue
-            
-            # Test each IP in the object
-            for ip_cidr in ip_list:
+            for ip_cidr in obj.get('IP', []):
                 ip_address = self._extract_ip_from_cidr(ip_cidr)
                 
                 # Skip invalid IPs
-                if not ip_address:
-                    continue
-                
-                print(f"Pinging {ip_address} ({name})...", end=" ")
-                self.results['total_tested'] += 1
-                
-                # Perform ping test
-                if self._ping_ip(ip_address):
-                    print("✓ Success")
-                    self.results['successful_count'] += 1
-                else:
-                    print("✗ Failed")
-                    self.results['failed_pings'].append({
-                        'name': name,
-                        'ip_address': ip_address,
-                        'original_cidr': ip_cidr
-                    })
+                if ip_address:
+                    targets.append((ip_address, name, ip_cidr))
+        
+        # Results land in their target's slot, so the report keeps object order
+        results_buf = [None] * len(targets)
+        try:
+            for i, result in self._ping_targets(targets):
+                results_buf[i] = result
+                status = "✓ Success" if result['success'] else "✗ Failed"
+                self._emit(f"Pinging {result['ip_address']} ({result['name']})... {status}")
+        except FileNotFoundError as e:
+            self._flush_log()
+            print(f"Error: Unable to run ping tests ({e})")
+            print("Install the ping command (or fping / icmplib) and try again.")
+            return False
+        self._flush_log()
+        
+        failed_pings = [
+            {
+                'name': result['name'],
+                'ip_address': result['ip_address'],
+                'original_cidr': result['original_cidr']
+            }
+            for result in results_buf if not result['success']
+        ]
+        self.results['total_tested'] += len(results_buf)
+        self.results['successful_count'] += len(results_buf) - len(failed_pings)
+        self.results['failed_pings'].extend(failed_pings)
         
         print("-" * 50)
         print(f"Ping test completed!")
@@ -135,8 +282,7 @@ class ObjectsPingChecker:
                 "successful_pings": self.results['successful_count'],
                 "failed_pings_count": len(self.results['failed_pings']),
                 "success_rate_percent": round(
-                    (self.results['successful_count'] / self.results['total_tested'] * 100) 
-                    if self.results['total_tested'] > 0 else 0, 2
+                    self.results['successful_count'] / max(1, self.results['total_tested']) * 100, 2
                 )
             },
             "failed_pings": self.results['failed_pings'],
@@ -145,8 +291,12 @@ class ObjectsPingChecker:
         
         # Save JSON report to file
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            if orjson:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2, ensure_ascii=False)
             print(f"Ping report saved successfully: {output_file}")
             return output_file
         except Exception as e:
@@ -181,10 +331,15 @@ class ObjectsPingChecker:
 
 def main():
     """Main function to execute the ping checker"""
+    parser = argparse.ArgumentParser(description="Ping every IP address of the FortiGate objects export")
+    parser.add_argument("--interactive", action="store_true", help="pause between steps while running")
+    args = parser.parse_args()
+    
     print("\n" + "=" * 40)
     print("🔎 FORTIGATE OBJECTS PING CHECKER 🔎")
     print("=" * 40)
-    time.sleep(2)
+    if args.interactive:
+        time.sleep(2)
     print(r'''
 
 
@@ -200,25 +355,29 @@ Author: XoTourLiff
           ''')
     
     # Initialize the ping checker
-    checker = ObjectsPingChecker()
+    checker = ObjectsPingChecker(interactive=args.interactive)
     
     # Load JSON data from local file
     if not checker.load_objects_json():
         print("\n⚠️  Failed to load objects data. Exiting...⚠️\n")
-        time.sleep(2)
+        if args.interactive:
+            time.sleep(2)
         return
     
     # Perform ping tests on all objects
-    time.sleep(1)
+    if args.interactive:
+        time.sleep(1)
     print("Starting network connectivity tests...")
-    time.sleep(1)
+    if args.interactive:
+        time.sleep(1)
     
     if not checker.ping_all_objects():
         print("Failed to complete ping tests. Exiting...")
         return
     
     # Generate and save ping report
-    time.sleep(1)
+    if args.interactive:
+        time.sleep(1)
     output_file = checker.generate_ping_report()
     
     if output_file:
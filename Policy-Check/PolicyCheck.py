@@ -2,16 +2,52 @@
 
 # Make sure JSON file is in the same directory as this script and named 'policycheck-forti.json'
 
+import argparse
 import json
-from collections import defaultdict, Counter
+import operator
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 import re
 import time
 
+# Optional: orjson reads the policy export and writes the report much faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# First number of a traffic counter such as "15420 MB" or "5 KB"
+BYTES_RE = re.compile(r'(\d+(?:\.\d+)?)')
+
+# Source/destination/service values that match everything
+ANY_TOKENS = frozenset(('all', 'any', ''))
+
+# Log settings that mean the rule is not logged
+NO_LOG_TOKENS = frozenset(('', 'none', 'disable'))
+
+# Every field the audits read from a FortiGate policy, fetched in one call
+POLICY_FIELDS = operator.itemgetter('Policy', 'Action', 'Source', 'Destination', 'Service', 'Bytes', 'Log', 'Interface Pair')
+
+# Values used when a sparse policy misses some of POLICY_FIELDS ('Policy' depends on the rule id)
+POLICY_DEFAULTS = {'Action': '', 'Source': '', 'Destination': '', 'Service': '', 'Bytes': '0 B', 'Log': '', 'Interface Pair': ''}
+
+@lru_cache(maxsize=4096)
+def _matches_any(value):
+    """Check if a source/destination/service value matches everything (cached, values repeat a lot)"""
+    value = value.lower()
+    return value in ANY_TOKENS or 'all' in value or 'any' in value
+
+@lru_cache(maxsize=256)
+def _is_logging_disabled(log_setting):
+    """Check if a log setting means the rule is not logged (cached, only a few settings exist)"""
+    return log_setting.strip().lower() in NO_LOG_TOKENS
+
 class FortigateAuditor:
 
-    def __init__(self, json_file_path=None, json_data=None):
+    def __init__(self, json_file_path=None, json_data=None, interactive=False):
         # Initialization of the auditor with JSON data
+        self.interactive = interactive
         if json_data:
            self.data = json_data
     
@@ -32,8 +68,11 @@ class FortigateAuditor:
     
     def _safe_string(self, value):
         """Safely converts a value to string"""
+        # Most fields are already plain strings or lists of strings
+        if type(value) is str:
+            return value
         if isinstance(value, list):
-            return ', '.join(str(v) for v in value)
+            return ', '.join(map(str, value))
         return str(value) if value else ''
     
     def _extract_bytes_value(self, bytes_str):
@@ -41,145 +80,160 @@ class FortigateAuditor:
         if not bytes_str or bytes_str == "0 B":
             return 0
         # Extract numbers from format "15420 MB", "5 KB", etc.
-        match = re.search(r'(\d+(?:\.\d+)?)', str(bytes_str))
+        match = BYTES_RE.search(str(bytes_str))
         return float(match.group(1)) if match else 0
     
-    def audit_unused_rules(self):
-        """Identify unused rules (Bytes = 0 B)"""
+    def _audit_all(self):
+        """Run every audit in a single pass over the policies"""
         unused_rules = []
-        for i, policy in enumerate(self.policies):
-            bytes_value = self._extract_bytes_value(policy.get('Bytes', '0 B'))
-            action = self._safe_string(policy.get('Action', '')).upper()
-            
-            if bytes_value == 0 and action == 'ACCEPT':
-                unused_rules.append({
-                    'id': i + 1,
-                    'name': self._safe_string(policy.get('Policy', f'Rule_{i+1}')),
-                    'action': action,
-                    'bytes': self._safe_string(policy.get('Bytes', '0 B')),
-                    'source': self._safe_string(policy.get('Source', '')),
-                    'destination': self._safe_string(policy.get('Destination', '')),
-                    'service': self._safe_string(policy.get('Service', ''))
-                })
-        
-        self.results['unused_rules'] = unused_rules
-        return unused_rules
-    
-    def audit_permissive_rules(self):
-        """Identify overly permissive rules with ALL ALL separation"""
         all_all_rules = []  # Critical: both source and destination are ALL
         single_all_rules = []  # High: only one of source/destination is ALL
+        signatures = []  # (signature, id, name, bytes) of every ACCEPT rule
+        no_logging = []
+        with_logging = []
+        
+        # Bound methods as locals: the loop body runs once per policy
+        safe_string = self._safe_string
+        extract_bytes_value = self._extract_bytes_value
         
         for i, policy in enumerate(self.policies):
-            source = self._safe_string(policy.get('Source', '')).lower()
-            destination = self._safe_string(policy.get('Destination', '')).lower() 
-            service = self._safe_string(policy.get('Service', '')).lower()
-            action = self._safe_string(policy.get('Action', '')).upper()
+            try:
+                fields = POLICY_FIELDS(policy)
+            except KeyError:
+                fields = POLICY_FIELDS({**POLICY_DEFAULTS, 'Policy': f'Rule_{i+1}', **policy})
+            raw_name, raw_action_value, raw_source, raw_destination, raw_service, raw_bytes, raw_log, raw_interface_pair = fields
             
-            src_any = source in ['all', 'any', ''] or 'any' in source or 'all' in source
-            dst_any = destination in ['all', 'any', ''] or 'any' in destination or 'all' in destination
-            srv_any = service in ['all', 'any', ''] or 'all' in service or 'any' in service
+            # Stringify every field once and share it between the audits
+            name = safe_string(raw_name)
+            raw_action = safe_string(raw_action_value)
+            action = raw_action.upper()
+            source = safe_string(raw_source)
+            destination = safe_string(raw_destination)
+            service = safe_string(raw_service)
+            bytes_str = safe_string(raw_bytes)
+            log = safe_string(raw_log)
+            rule_id = i + 1
             
-            if action == 'ACCEPT' and (src_any or dst_any or srv_any):
-                rule_info = {
-                    'id': i + 1,
-                    'name': self._safe_string(policy.get('Policy', f'Rule_{i+1}')),
-                    'source': self._safe_string(policy.get('Source', '')),
-                    'destination': self._safe_string(policy.get('Destination', '')),
-                    'service': self._safe_string(policy.get('Service', '')),
-                    'src_any': src_any,
-                    'dst_any': dst_any, 
-                    'srv_any': srv_any
-                }
+            if action == 'ACCEPT':
+                # Unused rules (Bytes = 0 B), the common "0 B" case skips the regex
+                if not raw_bytes or raw_bytes == "0 B" or extract_bytes_value(raw_bytes) == 0:
+                    unused_rules.append({
+                        'id': rule_id,
+                        'name': name,
+                        'action': action,
+                        'bytes': bytes_str,
+                        'source': source,
+                        'destination': destination,
+                        'service': service
+                    })
                 
-                # Separate ALL ALL (critical) from single ALL (high)
-                if src_any and dst_any and srv_any:
-                    rule_info['risk_level'] = 'CRITICAL'
-                    all_all_rules.append(rule_info)
-                else:
-                    rule_info['risk_level'] = 'HIGH'
-                    single_all_rules.append(rule_info)
-        
-        self.results['all_all_rules'] = all_all_rules
-        self.results['single_all_rules'] = single_all_rules
-        return {'all_all_rules': all_all_rules, 'single_all_rules': single_all_rules}
-    
-    def audit_duplicate_rules(self):
-        """Identify duplicate rules"""
-        rule_signatures = defaultdict(list)
-        
-        for i, policy in enumerate(self.policies):
-            action = self._safe_string(policy.get('Action', '')).upper()
-            if action != 'ACCEPT':
-                continue
+                # Overly permissive rules with ALL ALL separation
+                src_any = _matches_any(source)
+                dst_any = _matches_any(destination)
+                srv_any = _matches_any(service)
                 
-            # Create unique signature for rule
-            source = self._safe_string(policy.get('Source', '')).strip()
-            destination = self._safe_string(policy.get('Destination', '')).strip()
-            service = self._safe_string(policy.get('Service', '')).strip()
-            interface_pair = self._safe_string(policy.get('Interface Pair', '')).strip()
-            
-            signature = f"{source}|{destination}|{service}|{interface_pair}|{action}"
-            rule_signatures[signature].append({
-                'id': i + 1,
-                'name': self._safe_string(policy.get('Policy', f'Rule_{i+1}')),
-                'bytes': self._safe_string(policy.get('Bytes', '0 B'))
-            })
-        
-        # Convert to JSON serializable format
-        duplicates = []
-        for signature, rules in rule_signatures.items():
-            if len(rules) > 1:
-                duplicates.append({
-                    'signature': signature,
-                    'rules': rules,
-                    'count': len(rules)
-                })
-        
-        self.results['duplicate_rules'] = duplicates
-        return duplicates
-    
-    def audit_logging(self):
-        """Analyze log configuration"""
-        no_logging = []
-        with_logging = []
-        
-        for i, policy in enumerate(self.policies):
-            log_setting = self._safe_string(policy.get('Log', '')).strip().lower()
+                if src_any or dst_any or srv_any:
+                    # Separate ALL ALL (critical) from single ALL (high)
+                    critical = src_any and dst_any and srv_any
+                    rule_info = {
+                        'id': rule_id,
+                        'name': name,
+                        'source': source,
+                        'destination': destination,
+                        'service': service,
+                        'src_any': src_any,
+                        'dst_any': dst_any, 
+                        'srv_any': srv_any,
+                        'risk_level': 'CRITICAL' if critical else 'HIGH'
+                    }
+                    
+                    if critical:
+                        all_all_rules.append(rule_info)
+                    else:
+                        single_all_rules.append(rule_info)
+                
+                # Duplicate rules, keyed by a unique signature (grouped after the loop)
+                interface_pair = safe_string(raw_interface_pair).strip()
+                signature = (source.strip(), destination.strip(), service.strip(), interface_pair, action)
+                signatures.append((signature, rule_id, name, bytes_str))
             
+            # Log configuration
             rule_info = {
-                'id': i + 1,
-                'name': self._safe_string(policy.get('Policy', f'Rule_{i+1}')),
-                'log_setting': self._safe_string(policy.get('Log', '')),
-                'action': self._safe_string(policy.get('Action', '')),
-                'bytes': self._safe_string(policy.get('Bytes', '0 B'))
+                'id': rule_id,
+                'name': name,
+                'log_setting': log,
+                'action': raw_action,
+                'bytes': bytes_str
             }
             
-            if log_setting in ['', 'none', 'disable']:
+            if _is_logging_disabled(log):
                 no_logging.append(rule_info)
             else:
                 with_logging.append(rule_info)
         
+        # Most signatures are unique: only build rule entries for the repeated ones
+        signature_counts = Counter(entry[0] for entry in signatures)
+        rule_signatures = {}
+        for signature, rule_id, name, bytes_str in signatures:
+            if signature_counts[signature] > 1:
+                rule_signatures.setdefault(signature, []).append({
+                    'id': rule_id,
+                    'name': name,
+                    'bytes': bytes_str
+                })
+        
+        # Convert to JSON serializable format
+        duplicates = []
+        for signature, rules in rule_signatures.items():
+            duplicates.append({
+                'signature': '|'.join(signature),
+                'rules': rules,
+                'count': len(rules)
+            })
+        
+        self.results['unused_rules'] = unused_rules
+        self.results['all_all_rules'] = all_all_rules
+        self.results['single_all_rules'] = single_all_rules
+        self.results['duplicate_rules'] = duplicates
         self.results['logging'] = {
             'no_logging': no_logging,
             'with_logging': with_logging
         }
-        return self.results['logging']
+        return self.results
+    
+    def audit_unused_rules(self):
+        """Identify unused rules (Bytes = 0 B)"""
+        return self._audit_all()['unused_rules']
+    
+    def audit_permissive_rules(self):
+        """Identify overly permissive rules with ALL ALL separation"""
+        results = self._audit_all()
+        return {'all_all_rules': results['all_all_rules'], 'single_all_rules': results['single_all_rules']}
+    
+    def audit_duplicate_rules(self):
+        """Identify duplicate rules"""
+        return self._audit_all()['duplicate_rules']
+    
+    def audit_logging(self):
+        """Analyze log configuration"""
+        return self._audit_all()['logging']
     
     def generate_json_report(self, output_file='firewall_audit_report.json'):
         """Generate a complete JSON audit report"""
-        time.sleep(1)
+        if self.interactive:
+            time.sleep(1)
         print(f"Generating JSON audit report...")
         
-        # Execute all audits
-        self.audit_unused_rules()
-        permissive_results = self.audit_permissive_rules()
-        self.audit_duplicate_rules()
-        self.audit_logging()
+        # Execute all audits in one pass
+        self._audit_all()
         
         # Define total as the number of policies
         total = len(self.policies)
         
+        def percent(count):
+            """Share of the total rules, max(1, total) keeps an empty audit at 0%"""
+            return f"{round(count / max(1, total) * 100, 2)}%"
+        
         # Structure of the report
         report = {
             "audit_info": {
@@ -190,19 +244,19 @@ class FortigateAuditor:
                 "total_rules_analyzed": total,
 
                 "all_all_rules_count": len(self.results['all_all_rules']),
-                "all_all_rules_percent": f"{round(len(self.results['all_all_rules']) / total * 100, 2) if total > 0 else 0}%",
+                "all_all_rules_percent": percent(len(self.results['all_all_rules'])),
 
                 "single_all_rules_count": len(self.results['single_all_rules']),
-                "single_all_rules_percent": f"{round(len(self.results['single_all_rules']) / total * 100, 2) if total > 0 else 0}%",
+                "single_all_rules_percent": percent(len(self.results['single_all_rules'])),
 
                 "duplicate_groups_count": len(self.results['duplicate_rules']),
-                "duplicate_groups_percent": f"{round(len(self.results['duplicate_rules']) / total * 100, 2) if total > 0 else 0}%",
+                "duplicate_groups_percent": percent(len(self.results['duplicate_rules'])),
 
                 "unused_rules_count": len(self.results['unused_rules']),
-                "unused_rules_percent": f"{round(len(self.results['unused_rules']) / total * 100, 2) if total > 0 else 0}%",
+                "unused_rules_percent": percent(len(self.results['unused_rules'])),
                 
                 "rules_without_logging": len(self.results['logging']['no_logging']),
-                "rules_without_logging_percent": f"{round(len(self.results['logging']['no_logging']) / total * 100, 2) if total > 0 else 0}%"
+                "rules_without_logging_percent": percent(len(self.results['logging']['no_logging']))
             },
             "detailed_results": {
                 "unused_rules": self.results['unused_rules'],
@@ -216,8 +270,12 @@ class FortigateAuditor:
 
         # Save the JSON report
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            if orjson:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2, ensure_ascii=False)
             print(f"Audit saved in: {output_file}")
             return output_file
         except Exception as e:
@@ -276,22 +334,28 @@ class FortigateAuditor:
         
         return recommendations
 
-def load_json_from_file():
+def load_json_from_file(interactive=False):
     """JSON local loading function"""
     try:
-        with open('policycheck-forti.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open('policycheck-forti.json', 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        if interactive:
             time.sleep(2)
         print(f"Policycheck-forti.json file loaded from local disk!")
         return data
     except FileNotFoundError:
-        time.sleep(2)
+        if interactive:
+            time.sleep(2)
         print("Error: File 'policycheck-forti.json' not found")
-        time.sleep(2)
+        if interactive:
+            time.sleep(2)
         print("Please put the file in the same directory as this script.")
-        time.sleep(1)
+        if interactive:
+            time.sleep(1)
         print("Make sure the file is named 'policycheck-forti.json'.")
-        time.sleep(1)
+        if interactive:
+            time.sleep(1)
         return None
     except Exception as e:
         print(f"ERROR: Unable to read Policycheck-forti.json")
@@ -300,10 +364,15 @@ def load_json_from_file():
 
 def main():
     """Main function to run the auditor"""
+    parser = argparse.ArgumentParser(description="Audit the FortiGate policies export")
+    parser.add_argument("--interactive", action="store_true", help="pause between steps while running")
+    args = parser.parse_args()
+    
     print("\n" + "-" * 35)
     print("🛡️  FortiGate Firewall Auditor 🛡️")
     print("-" * 35, "\n")
-    time.sleep(2)
+    if args.interactive:
+        time.sleep(2)
     print(r"""
 __________      .__  .__              _________ .__                   __    
 \______   \____ |  | |__| ____ ___.__.\_   ___ \|  |__   ____   ____ |  | __
@@ -317,24 +386,26 @@ Author: XoTourLiff
 """)
     
     # Try to load JSON from local file
-    user_data = load_json_from_file()
+    user_data = load_json_from_file(args.interactive)
     
     if not user_data:
         print("\n❗Fatal error: No JSON data or the JSON format is invalid. ❗​\n")
         return
     
-    auditor = FortigateAuditor(json_data=user_data)
+    auditor = FortigateAuditor(json_data=user_data, interactive=args.interactive)
     if not auditor or not hasattr(auditor, 'policies'):
         print("Failed to initialize auditor: invalid or incomplete JSON data.")
         return
-    time.sleep(2)   
+    if args.interactive:
+        time.sleep(2)
     print("Performing analysis on your actual data...")
     
     # Generate JSON report
     output_file = auditor.generate_json_report('firewall_audit_report.json')
     
     if output_file:
-        time.sleep(1)
+        if args.interactive:
+            time.sleep(1)
         print(f"\n🕵️  Report generated successfully named: '{output_file}', Enjoy your audit!🕵️\n")
     else:
         print("FAILED to generate JSON report, please check the logs for errors.")